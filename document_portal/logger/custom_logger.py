@@ -1,10 +1,86 @@
 import os
+import atexit
+import queue
+import time
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 import structlog
 
 
+def _orjson_dumps(event_dict, **kwargs) -> str:
+    # stdlib handlers expect str, orjson returns UTF-8 bytes
+    return orjson.dumps(event_dict, **kwargs).decode("utf-8")
+
+
+_LOG_BUFFER_SIZE = 128 * 1024
+_FLUSH_INTERVAL = 2.0  # seconds a record may wait in memory before it reaches the file
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler batching formatted records and writing them ~128KB at a time.
+    ERROR and above are written immediately, and nothing waits longer than _FLUSH_INTERVAL.
+    """
+
+    def __init__(self, filename, mode="a", encoding=None, delay=False, errors=None):
+        super().__init__(filename, mode, encoding=encoding, delay=delay, errors=errors)
+        self._pending = []
+        self._pending_size = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        # Batches always end on a record boundary, so processes sharing the file
+        # (uvicorn/xdist workers started in the same second) never split each other's lines
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        self._pending.append(msg)
+        self._pending_size += len(msg)
+        # errors must survive a crash/kill of the worker right after they are logged
+        if (record.levelno >= logging.ERROR
+                or self._pending_size >= _LOG_BUFFER_SIZE
+                or time.monotonic() - self._last_flush >= _FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending:
+                if self.stream is None and self.mode != "w":
+                    self.stream = self._open()
+                if self.stream is not None:
+                    self.stream.write("".join(self._pending))
+                    self.stream.flush()
+                self._pending.clear()
+                self._pending_size = 0
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue stays idle for _FLUSH_INTERVAL."""
+
+    def dequeue(self, block):
+        if not block:
+            return self.queue.get(block)
+        while True:
+            try:
+                return self.queue.get(True, timeout=_FLUSH_INTERVAL)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
 class CustomLogger:
+    # logging/structlog are process-wide, so configure them once and hand out cached loggers
+    _configured = False
+    _loggers: dict = {}
+
     def __init__(self, log_dir = "logs"):
         # ensure log directory exists
         self.logs_dir = os.path.join(os.getcwd(), log_dir)
@@ -14,23 +90,32 @@ class CustomLogger:
         log_file = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
         self.log_file_path = os.path.join(self.logs_dir, log_file)
 
-    def get_logger(self, name=__file__):
-        logger_name = os.path.basename(name)
+    @classmethod
+    def _configure_once(cls, log_file_path):
+        if cls._configured:
+            return
+        cls._configured = True
 
-        #configure ogging for file and console
-        file_handler = logging.FileHandler(self.log_file_path)
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(logging.Formatter("%(message)s")) # raw JSON lines
+        # leave an already-configured root logger alone so records are never emitted twice
+        root = logging.getLogger()
+        if not root.handlers:
+            #configure ogging for file and console
+            file_handler = _BufferedFileHandler(log_file_path)
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(logging.Formatter("%(message)s")) # raw JSON lines
 
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter("%(message)s"))
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter("%(message)s"))
 
-        logging.basicConfig(
-            level = logging.INFO,
-            format = "%(message)s",
-            handlers = [file_handler, console_handler]
-        )
+            # callers only enqueue records; a background thread does the actual I/O
+            log_queue = queue.Queue(-1)
+            listener = _FlushingQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+            listener.start()
+            atexit.register(cls._shutdown, listener, file_handler)
+
+            root.addHandler(QueueHandler(log_queue))
+            root.setLevel(logging.INFO)
 
         # configure structlog for JSON structured logging
         structlog.configure(
@@ -38,13 +123,25 @@ class CustomLogger:
                 structlog.processors.TimeStamper(fmt="est", utc=True, key = "timestamp"),
                 structlog.processors.add_log_level,
                 structlog.processors.EventRenamer(to="event"),
-                structlog.processors.JSONRenderer()
+                structlog.processors.JSONRenderer(serializer=_orjson_dumps)
             ],
             logger_factory=structlog.stdlib.LoggerFactory(),
             cache_logger_on_first_use=True,
         )
 
-        return structlog.get_logger(logger_name)
+    @staticmethod
+    def _shutdown(listener, file_handler):
+        # drain queued records, then flush the file buffer
+        listener.stop()
+        file_handler.close()
+
+    def get_logger(self, name=__file__):
+        logger_name = os.path.basename(name)
+        self._configure_once(self.log_file_path)
+        logger = self._loggers.get(logger_name)
+        if logger is None:
+            logger = self._loggers[logger_name] = structlog.get_logger(logger_name)
+        return logger
     
     # --example--
     
@@ -4,12 +4,13 @@ Test runner script for Document Portal project
 """
 
 import sys
-import subprocess
 import argparse
 from pathlib import Path
 
+import pytest
 
-def run_tests(test_type="all", verbose=False, coverage=False):
+
+def run_tests(test_type="all", verbose=False, coverage=False, workers=None):
     """
     Run tests based on the specified type
     
@@ -17,10 +18,11 @@ def run_tests(test_type="all", verbose=False, coverage=False):
         test_type (str): Type of tests to run ('all', 'unit', 'integration', 'fast')
         verbose (bool): Run with verbose output
         coverage (bool): Run with coverage reporting
+        workers (str): pytest-xdist worker count ('auto' or a number), None to run serially
     """
     
-    # Base pytest command
-    cmd = ["python", "-m", "pytest"]
+    # pytest arguments (run in-process, no extra interpreter start-up)
+    cmd = []
     
     # Add verbose flag
     if verbose:
@@ -30,19 +32,23 @@ def run_tests(test_type="all", verbose=False, coverage=False):
     if coverage:
         cmd.extend(["--cov=src", "--cov=api", "--cov-report=html", "--cov-report=term"])
     
+    # Spread tests over pytest-xdist workers
+    if workers:
+        cmd.extend(["-n", str(workers)])
+    
     # Add test type filters
     if test_type == "unit":
-        cmd.append("-m unit")
+        cmd.extend(["-m", "unit"])
     elif test_type == "integration":
-        cmd.append("-m integration")
+        cmd.extend(["-m", "integration"])
     elif test_type == "fast":
-        cmd.append("-m 'not slow'")
+        cmd.extend(["-m", "not slow"])
     elif test_type == "api":
-        cmd.append("-m api")
+        cmd.extend(["-m", "api"])
     elif test_type == "llm":
-        cmd.append("-m llm")
+        cmd.extend(["-m", "llm"])
     elif test_type == "faiss":
-        cmd.append("-m faiss")
+        cmd.extend(["-m", "faiss"])
     elif test_type != "all":
         print(f"Unknown test type: {test_type}")
         print("Available types: all, unit, integration, fast, api, llm, faiss")
@@ -52,18 +58,16 @@ def run_tests(test_type="all", verbose=False, coverage=False):
     cmd.append("tests/")
     
     print(f"Running {test_type} tests...")
-    print(f"Command: {' '.join(cmd)}")
+    print(f"Command: pytest {' '.join(cmd)}")
     print("-" * 50)
     
-    try:
-        result = subprocess.run(cmd, check=True)
+    if pytest.main(cmd) == 0:
         print("-" * 50)
         print(f"✅ All {test_type} tests passed!")
         return True
-    except subprocess.CalledProcessError as e:
-        print("-" * 50)
-        print(f"❌ Some {test_type} tests failed!")
-        return False
+    print("-" * 50)
+    print(f"❌ Some {test_type} tests failed!")
+    return False
 
 
 def main():
@@ -85,6 +89,11 @@ def main():
         action="store_true",
         help="Run with coverage reporting"
     )
+    parser.add_argument(
+        "--workers", "-n",
+        default=None,
+        help="Run tests in parallel with pytest-xdist ('auto' or a number)"
+    )
     
     args = parser.parse_args()
     
@@ -94,7 +103,7 @@ def main():
         sys.exit(1)
     
     # Run tests
-    success = run_tests(args.type, args.verbose, args.coverage)
+    success = run_tests(args.type, args.verbose, args.coverage, args.workers)
     
     if not success:
         sys.exit(1)
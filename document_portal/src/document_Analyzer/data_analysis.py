@@ -22,9 +22,12 @@ class DocumentAnalyzer:
 
             #prepare parsers
             self.parser = JsonOutputParser(pydantic_object=Metadata)
+            self._format_instructions = self.parser.get_format_instructions()
             self.fixing_parser = OutputFixingParser.from_llm(parser=self.parser, llm=self.llm)
 
-            self.prompt = PROMPT_REGISTRY["document_analysis"]
+            self.prompt = PROMPT_REGISTRY["document_analysis"].partial(
+                format_instructions=self._format_instructions
+            )
 
             self.log.info("DocumentAnalyzer initialized successfully")
 
@@ -42,10 +45,7 @@ class DocumentAnalyzer:
 
             self.log.info("Meta-data analysis chain initialized")
 
-            response = chain.invoke({
-                "format_instructions": self.parser.get_format_instructions(),
-                "document_text": document_text
-            })
+            response = chain.invoke({"document_text": document_text})
 
             self.log.info("Meta-data analysis completed successfully", keys=list(response.keys()))
 
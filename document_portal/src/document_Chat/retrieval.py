@@ -14,6 +14,9 @@ from logger import GLOBAL_LOGGER as log
 from prompts.prompt_library import PROMPT_REGISTRY
 from model.models import PromptType
 
+# IVF indexes score only the nprobe nearest clusters instead of the whole index
+IVF_NPROBE = 16
+
 
 class ConversationalRAG:
     """
@@ -28,6 +31,7 @@ class ConversationalRAG:
     def __init__(self, session_id: Optional[str], retriever=None):
         try:
             self.session_id = session_id
+            self.model_loader = ModelLoader()
 
             # Load LLM and prompts once
             self.llm = self._load_llm()
@@ -66,13 +70,15 @@ class ConversationalRAG:
             if not os.path.isdir(index_path):
                 raise FileNotFoundError(f"FAISS index directory not found: {index_path}")
 
-            embeddings = ModelLoader().load_embeddings()
+            embeddings = self.model_loader.load_embeddings()
             vectorstore = FAISS.load_local(
                 index_path,
                 embeddings,
                 index_name=index_name,
                 allow_dangerous_deserialization=True,  # ok if you trust the index
             )
+            if hasattr(vectorstore.index, "nprobe"):  # flat indexes have no such knob
+                vectorstore.index.nprobe = IVF_NPROBE
 
             if search_kwargs is None:
                 search_kwargs = {"k": k}
@@ -125,7 +131,7 @@ class ConversationalRAG:
 
     def _load_llm(self):
         try:
-            llm = ModelLoader().load_llm()
+            llm = self.model_loader.load_llm()
             if not llm:
                 raise ValueError("LLM could not be loaded")
             log.info("LLM loaded successfully", session_id=self.session_id)
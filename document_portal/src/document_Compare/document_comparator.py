@@ -1,7 +1,7 @@
 import sys
-from dotenv import load_dotenv
 import pandas as pd
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 from langchain.output_parsers import OutputFixingParser
 from utils.model_loader import ModelLoader
 from logger.custom_logger import CustomLogger
@@ -11,25 +11,33 @@ from model.models import SummaryResponse, PromptType
 
 class DocumentComparatorLLM:
     def __init__(self):
-        load_dotenv()
         self.log = CustomLogger().get_logger(__name__)
         self.model_loader = ModelLoader()
         self.llm = self.model_loader.load_llm()
         self.parser = JsonOutputParser(pydantic_object=SummaryResponse)
-        self.fix_parser = OutputFixingParser.from_llm(llm=self.llm, parser=self.parser)
-        self.prompt = PROMPT_REGISTRY[PromptType.DOCUMENT_COMPARISON.value]
-        self.chain = self.prompt | self.llm | self.parser
+        # schema-derived and constant per parser, so build it once
+        self._format_instructions = self.parser.get_format_instructions()
+        # bind the constant format instructions once; only combined_docs varies per call
+        self.prompt = PROMPT_REGISTRY[PromptType.DOCUMENT_COMPARISON.value].partial(
+            format_instruction=self._format_instructions
+        )
+        # keep the raw LLM text so a malformed reply can be repaired without regenerating it
+        self.chain = self.prompt | self.llm | StrOutputParser()
         self.log.info("DocumentComparatorLLM initialized successfully", model = self.llm)
 
     def compare_documents(self, combined_docs: str) -> pd.DataFrame:
         try:
-            inputs = {
-                "combined_docs": combined_docs,
-                "format_instructions": self.parser.get_format_instructions()
-            }
+            inputs = {"combined_docs": combined_docs}
 
             self.log.info("Invoking DocumentComparatorLLM chain")
-            response = self.chain.invoke(inputs)
+            raw_output = self.chain.invoke(inputs)
+            try:
+                response = self.parser.parse(raw_output)
+            except OutputParserException:
+                # slow path only: one extra LLM call to fix the output
+                self.log.warning("Malformed comparison output, retrying with OutputFixingParser")
+                fix_parser = OutputFixingParser.from_llm(llm=self.llm, parser=self.parser)
+                response = fix_parser.parse(raw_output)
             self.log.info("chain invoked successfully", response_preview=str(response)[:100])
             return self._format_response(response)
         except Exception as e:
@@ -38,6 +46,11 @@ class DocumentComparatorLLM:
         
     def _format_response(self, response_parsed: list[dict]) -> pd.DataFrame:
         try:
+            if response_parsed and isinstance(response_parsed, list) and isinstance(response_parsed[0], dict):
+                # hand pandas columns directly (union of keys, first-seen order) instead of row records
+                keys = dict.fromkeys(k for row in response_parsed for k in row)
+                columns = {k: [row.get(k) for row in response_parsed] for k in keys}
+                return pd.DataFrame(columns, copy=False)
             df = pd.DataFrame(response_parsed)
             return df
         except Exception as e:
@@ -5,6 +5,7 @@ import json
 import uuid
 import hashlib
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List, Optional, Dict, Any
 import fitz  # PyMuPDF
@@ -14,11 +15,22 @@ from langchain_community.vectorstores import FAISS
 from utils.model_loader import ModelLoader
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
-from utils.file_io import generate_session_id, save_uploaded_files
+from utils.file_io import generate_session_id, save_uploaded_files, write_uploaded_file
 from utils.document_ops import load_documents, concat_for_analysis, concat_for_comparison
+from utils.pdf_text import read_pdf_pages
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 
+# page headers as bound str.format templates, parsed once at import
+_PAGE_HEADER = "\n--- Page {} ---\n".format
+_COMPARE_PAGE_HEADER = "\n --- Page {} --- \n".format
+
+
+@lru_cache(maxsize=16)
+def _make_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    # splitters hold no per-call state, so one per (chunk_size, chunk_overlap) is shared
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
 # FAISS Manager (load-or-create)
 class FaissManager:
     def __init__(self, index_dir: Path, model_loader: Optional[ModelLoader] = None):
@@ -130,7 +142,7 @@ class ChatIngestor:
         return base # fallback: "faiss_index/"
         
     def _split(self, docs: List[Document], chunk_size=1000, chunk_overlap=200) -> List[Document]:
-        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        splitter = _make_splitter(chunk_size, chunk_overlap)
         chunks = splitter.split_documents(docs)
         log.info("Documents split", chunks=len(chunks), chunk_size=chunk_size, overlap=chunk_overlap)
         return chunks
@@ -189,11 +201,7 @@ class DocHandler:
             if not filename.lower().endswith(".pdf"):
                 raise ValueError("Invalid file type. Only PDFs are allowed.")
             save_path = os.path.join(self.session_path, filename)
-            with open(save_path, "wb") as f:
-                if hasattr(uploaded_file, "read"):
-                    f.write(uploaded_file.read())
-                else:
-                    f.write(uploaded_file.getbuffer())
+            write_uploaded_file(uploaded_file, save_path)
             log.info("PDF saved successfully", file=filename, save_path=save_path, session_id=self.session_id)
             return save_path
         except Exception as e:
@@ -202,13 +210,9 @@ class DocHandler:
 
     def read_pdf(self, pdf_path: str) -> str:
         try:
-            text_chunks = []
-            with fitz.open(pdf_path) as doc:
-                for page_num in range(doc.page_count):
-                    page = doc.load_page(page_num)
-                    text_chunks.append(f"\n--- Page {page_num + 1} ---\n{page.get_text()}")  # type: ignore
-            text = "\n".join(text_chunks)
-            log.info("PDF read successfully", pdf_path=pdf_path, session_id=self.session_id, pages=len(text_chunks))
+            pages = read_pdf_pages(pdf_path)
+            text = "\n".join([_PAGE_HEADER(page_num) + page_text for page_num, page_text in enumerate(pages, 1)])
+            log.info("PDF read successfully", pdf_path=pdf_path, session_id=self.session_id, pages=len(pages))
             return text
         except Exception as e:
             log.error("Failed to read PDF", error=str(e), pdf_path=pdf_path, session_id=self.session_id)
@@ -231,11 +235,7 @@ class DocumentComparator:
             for fobj, out in ((reference_file, ref_path), (actual_file, act_path)):
                 if not fobj.name.lower().endswith(".pdf"):
                     raise ValueError("Only PDF files are allowed.")
-                with open(out, "wb") as f:
-                    if hasattr(fobj, "read"):
-                        f.write(fobj.read())
-                    else:
-                        f.write(fobj.getbuffer())
+                write_uploaded_file(fobj, out)
             log.info("Files saved", reference=str(ref_path), actual=str(act_path), session=self.session_id)
             return ref_path, act_path
         except Exception as e:
@@ -247,12 +247,12 @@ class DocumentComparator:
             with fitz.open(pdf_path) as doc:
                 if doc.is_encrypted:
                     raise ValueError(f"PDF is encrypted: {pdf_path.name}")
-                parts = []
-                for page_num in range(doc.page_count):
-                    page = doc.load_page(page_num)
-                    text = page.get_text()  # type: ignore
-                    if text.strip():
-                        parts.append(f"\n --- Page {page_num + 1} --- \n{text}")
+            # large comparison PDFs go through the shared process pool
+            parts = [
+                _COMPARE_PAGE_HEADER(page_num) + text
+                for page_num, text in enumerate(read_pdf_pages(str(pdf_path)), 1)
+                if text.strip()
+            ]
             log.info("PDF read successfully", file=str(pdf_path), pages=len(parts))
             return "\n".join(parts)
         except Exception as e:
@@ -1,29 +1,71 @@
 # tests/conftest.py
 
 import pytest
-import tempfile
-import shutil
 import os
+import re
 from unittest.mock import Mock, patch
 from pathlib import Path
 
 # Test fixtures and configuration
 
+# Canonical sample payloads, built once at import and returned by the fixtures below
+_SAMPLE_PDF = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Contents 4 0 R\n>>\nendobj\n4 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 12 Tf\n72 720 Td\n(Test Document) Tj\nET\nendstream\nendobj\nxref\n0 5\n0000000000 65535 f \n0000000009 00000 n \n0000000058 00000 n \n0000000115 00000 n \n0000000204 00000 n \ntrailer\n<<\n/Size 5\n/Root 1 0 R\n>>\nstartxref\n297\n%%EOF"
+_PDF_PAYLOADS = {
+    "simple": b"Test PDF content",
+    "ref": b"Reference document content",
+    "actual": b"Actual document content",
+}
+_SAMPLE_TEXT = "This is a sample document for testing purposes. It contains multiple sentences to test document processing functionality."
+
+
+class MockModelLoader:
+    """Stand-in for ModelLoader with preset LLM and embedding mocks"""
+
+    def __init__(self):
+        self.llm = Mock()
+        self.embeddings = Mock()
+        self.config = {}
+        self.load_llm = Mock(return_value=self.llm)
+        self.load_embeddings = Mock(return_value=self.embeddings)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """FastAPI TestClient shared by the whole session (app startup/shutdown run once)"""
+    # Imported here to defer only the app/route setup in api.main; the test modules
+    # still import src.* (and with it LangChain/Google/Groq) at collection time
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    with TestClient(app) as c:
+        yield c
+
 
 @pytest.fixture(scope="session")
-def test_data_dir():
-    """Create a temporary directory for test data"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir, ignore_errors=True)
+def test_data_dir(tmp_path_factory):
+    """Create a temporary directory for test data (cleaned up by pytest's tmp_path retention)"""
+    return str(tmp_path_factory.mktemp("test_data"))
 
 
 @pytest.fixture(scope="function")
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for each test"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def mock_loader():
+    """Fresh MockModelLoader per test, to use as a patched ModelLoader's return_value"""
+    return MockModelLoader()
+
+
+@pytest.fixture(autouse=True)
+def reset_model_loader_cache():
+    """Drop ModelLoader's process-wide config/key/client caches after every test"""
+    yield
+    from utils.model_loader import ModelLoader
+
+    ModelLoader.reset_cache()
 
 
 @pytest.fixture
@@ -35,7 +77,7 @@ def mock_model_loader():
         yield mock_instance
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_llm():
     """Mock LLM for testing"""
     mock_llm = Mock()
@@ -43,7 +85,7 @@ def mock_llm():
     return mock_llm
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_embeddings():
     """Mock embeddings for testing"""
     mock_emb = Mock()
@@ -52,19 +94,25 @@ def mock_embeddings():
     return mock_emb
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pdf_content():
     """Sample PDF content for testing"""
-    return b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Contents 4 0 R\n>>\nendobj\n4 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 12 Tf\n72 720 Td\n(Test Document) Tj\nET\nendstream\nendobj\nxref\n0 5\n0000000000 65535 f \n0000000009 00000 n \n0000000058 00000 n \n0000000115 00000 n \n0000000204 00000 n \ntrailer\n<<\n/Size 5\n/Root 1 0 R\n>>\nstartxref\n297\n%%EOF"
+    return _SAMPLE_PDF
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_text_content():
     """Sample text content for testing"""
-    return "This is a sample document for testing purposes. It contains multiple sentences to test document processing functionality."
+    return _SAMPLE_TEXT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def pdf_payloads():
+    """Canonical upload bodies for the endpoint tests ("simple", "ref", "actual")"""
+    return _PDF_PAYLOADS
+
+
+@pytest.fixture(scope="session")
 def mock_faiss_index():
     """Mock FAISS index for testing"""
     mock_index = Mock()
@@ -77,7 +125,7 @@ def mock_faiss_index():
     return mock_index
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_chain():
     """Mock LangChain chain for testing"""
     mock_chain = Mock()
@@ -88,7 +136,7 @@ def mock_chain():
     return mock_chain
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config():
     """Test configuration dictionary"""
     return {
@@ -116,17 +164,35 @@ def pytest_configure(config):
     )
 
 
+def pytest_sessionstart(session):
+    """One-shot environment setup, done before collection imports the app"""
+    # Read .env first so a developer's real keys win; placeholders only fill keys that are
+    # neither exported nor in .env, letting ModelLoader/ApiKeyManager initialise anyway
+    from dotenv import load_dotenv
+
+    load_dotenv(override=False)
+    os.environ.setdefault("GOOGLE_API_KEY", "test")
+    os.environ.setdefault("GROQ_API_KEY", "test")
+
+
+# Keyword patterns used to auto-mark collected tests (matched against the lowercased test name)
+SLOW_KEYWORDS = re.compile(r"llm|model|embedding|faiss")
+INTEGRATION_KEYWORDS = re.compile(r"endpoint|api")
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers"""
     for item in items:
+        name = item.name.lower()
+
         # Add unit marker to all tests by default
         if "test_" in item.name:
             item.add_marker(pytest.mark.unit)
         
         # Add slow marker to tests that might take longer
-        if any(keyword in item.name.lower() for keyword in ["llm", "model", "embedding", "faiss"]):
+        if SLOW_KEYWORDS.search(name):
             item.add_marker(pytest.mark.slow)
         
         # Add integration marker to API endpoint tests
-        if "endpoint" in item.name.lower() or "api" in item.name.lower():
+        if INTEGRATION_KEYWORDS.search(name):
             item.add_marker(pytest.mark.integration)
@@ -3,9 +3,10 @@ from pathlib import Path
 from typing import Iterable, List
 from fastapi import UploadFile
 from langchain.schema import Document
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, TextLoader
+from langchain_community.document_loaders import Docx2txtLoader, TextLoader
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
+from utils.pdf_text import read_pdf_pages
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 
 
@@ -16,7 +17,8 @@ def load_documents(paths: Iterable[Path]) -> List[Document]:
         for p in paths:
             ext = p.suffix.lower()
             if ext == ".pdf":
-                loader = PyPDFLoader(str(p))
+                docs.extend(read_pdf_pymupdf(p))
+                continue
             elif ext == ".docx":
                 loader = Docx2txtLoader(str(p))
             elif ext == ".txt":
@@ -31,6 +33,14 @@ def load_documents(paths: Iterable[Path]) -> List[Document]:
         log.error("Failed loading documents", error=str(e))
         raise DocumentPortalException("Error loading documents", e) from e
 
+def read_pdf_pymupdf(path: Path) -> List[Document]:
+    """One Document per page via PyMuPDF (same source/page metadata as PyPDFLoader)."""
+    source = str(path)
+    return [
+        Document(page_content=text, metadata={"source": source, "page": i})
+        for i, text in enumerate(read_pdf_pages(source))
+    ]
+
 def concat_for_analysis(docs: List[Document]) -> str:
     parts = []
     for d in docs:
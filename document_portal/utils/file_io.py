@@ -1,5 +1,6 @@
 from __future__ import annotations
 import re
+import shutil
 import uuid
 from pathlib import Path
 from datetime import datetime
@@ -10,6 +11,7 @@ from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+WRITE_BLOCK_SIZE = 128 * 1024  # fewer, larger write() syscalls than the 8KB default
 
 # ----------------------------- #
 # Helpers (file I/O + loading)  #
@@ -18,6 +20,19 @@ def generate_session_id(prefix: str = "session") -> str:
     ist = ZoneInfo("Asia/Kolkata")
     return f"{prefix}_{datetime.now(ist).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
+def write_uploaded_file(uploaded_file, out_path) -> None:
+    """Write an uploaded file (file-like .read() or .getbuffer()) to disk in 128KB blocks."""
+    if hasattr(uploaded_file, "read"):
+        with open(out_path, "wb") as f:
+            shutil.copyfileobj(uploaded_file, f, WRITE_BLOCK_SIZE)
+        return
+    view = memoryview(uploaded_file.getbuffer())
+    # unbuffered binary file: slices of the view go straight to write() without a copy
+    with open(out_path, "wb", buffering=0) as f:
+        offset = 0
+        while offset < len(view):
+            offset += f.write(view[offset:offset + WRITE_BLOCK_SIZE])
+
 def save_uploaded_files(uploaded_files: Iterable, target_dir: Path) -> List[Path]:
     """Save uploaded files (Streamlit-like) and return local paths."""
     try:
@@ -34,11 +49,7 @@ def save_uploaded_files(uploaded_files: Iterable, target_dir: Path) -> List[Path
             fname = f"{safe_name}_{uuid.uuid4().hex[:6]}{ext}"
             fname = f"{uuid.uuid4().hex[:8]}{ext}"
             out = target_dir / fname
-            with open(out, "wb") as f:
-                if hasattr(uf, "read"):
-                    f.write(uf.read())
-                else:
-                    f.write(uf.getbuffer())  # fallback
+            write_uploaded_file(uf, out)
             saved.append(out)
             log.info("File saved for ingestion", uploaded=name, saved_as=str(out))
         return saved
@@ -1,6 +1,9 @@
 import os
 import sys
 import json
+import asyncio
+from functools import lru_cache
+import httpx
 from dotenv import load_dotenv
 from utils.config_loader import load_config
 from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
@@ -26,16 +29,18 @@ class ApiKeyManager:
             except Exception as e:
                 log.warning("Failed to parse API_KEYS as JSON", error=str(e))
 
-        # Fallback to individual env vars
+        # Fallback to individual env vars, collecting whatever is still missing in the same pass
+        missing = []
         for key in self.REQUIRED_KEYS:
             if not self.api_keys.get(key):
                 env_val = os.getenv(key)
                 if env_val:
                     self.api_keys[key] = env_val
                     log.info(f"Loaded {key} from individual env var")
+                else:
+                    missing.append(key)
 
         # Final check
-        missing = [k for k in self.REQUIRED_KEYS if not self.api_keys.get(k)]
         if missing:
             log.error("Missing required API keys", missing_keys=missing)
             raise DocumentPortalException("Missing API keys", sys)
@@ -50,21 +55,139 @@ class ApiKeyManager:
         return val
 
 
+_DOTENV_LOADED = False
+
+
+def _load_dotenv_once():
+    """
+    Load .env at most once per process; variables already exported keep their values.
+    """
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    load_dotenv(override=False)
+    _DOTENV_LOADED = True
+
+
+# Model clients are heavyweight (HTTP sessions, credentials) and safe to share,
+# so each distinct configuration is built once per process.
+@lru_cache(maxsize=None)
+def _google_embeddings(model_name: str, api_key: str):
+    return GoogleGenerativeAIEmbeddings(model=model_name, google_api_key=api_key) #type: ignore
+
+
+@lru_cache(maxsize=None)
+def _google_llm(model_name: str, api_key: str, temperature: float, max_tokens: int):
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        google_api_key=api_key,
+        temperature=temperature,
+        max_output_tokens=max_tokens
+    )
+
+
+# One keep-alive pool for every Groq client, so TLS connections survive across models/requests.
+# Google's client runs over its own gRPC/REST transport and takes no httpx client.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+@lru_cache(maxsize=1)
+def _http_clients():
+    return httpx.Client(limits=_HTTP_LIMITS), httpx.AsyncClient(limits=_HTTP_LIMITS)
+
+
+# strong references to in-flight aclose() tasks; the event loop only keeps weak ones
+_CLOSING_TASKS = set()
+
+
+def _close_http_clients():
+    """Close the pooled clients (if they were ever created), then forget them."""
+    if _http_clients.cache_info().currsize:
+        http_client, http_async_client = _http_clients()
+        http_client.close()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(http_async_client.aclose())
+        else:
+            task = loop.create_task(http_async_client.aclose())
+            _CLOSING_TASKS.add(task)
+            task.add_done_callback(_CLOSING_TASKS.discard)
+    _http_clients.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _groq_llm(model_name: str, api_key: str, temperature: float):
+    http_client, http_async_client = _http_clients()
+    return ChatGroq(
+        model=model_name,
+        api_key=api_key, #type: ignore
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
 class ModelLoader:
     """
     Loads embedding models and LLMs based on config and environment.
     """
 
+    # provider -> builder(llm_config, api_key_mgr); each delegates to a cached module-level factory
+    _LLM_FACTORIES = {
+        "google": lambda cfg, keys: _google_llm(
+            cfg.get("model_name"),
+            keys.get("GOOGLE_API_KEY"),
+            cfg.get("temperature", 0.2),
+            cfg.get("max_output_tokens", 2048),
+        ),
+        "groq": lambda cfg, keys: _groq_llm(
+            cfg.get("model_name"),
+            keys.get("GROQ_API_KEY"),
+            cfg.get("temperature", 0.2),
+        ),
+        # "openai": lambda cfg, keys: ChatOpenAI(
+        #     model=cfg.get("model_name"),
+        #     api_key=keys.get("OPENAI_API_KEY"),
+        #     temperature=cfg.get("temperature", 0.2),
+        #     max_tokens=cfg.get("max_output_tokens", 2048),
+        # ),
+    }
+
+    # parsed YAML config and validated API keys, shared by every instance in the process
+    _config = None
+    _api_key_mgr = None
+
     def __init__(self):
         if os.getenv("ENV", "local").lower() != "production":
-            load_dotenv()
+            _load_dotenv_once()
             log.info("Running in LOCAL mode: .env loaded")
         else:
             log.info("Running in PRODUCTION mode")
 
-        self.api_key_mgr = ApiKeyManager()
-        self.config = load_config()
-        log.info("YAML config loaded", config_keys=list(self.config.keys()))
+        cls = type(self)
+        if cls._api_key_mgr is None:
+            cls._api_key_mgr = ApiKeyManager()
+        if cls._config is None:
+            cls._config = load_config()
+            log.info("YAML config loaded", config_keys=list(cls._config.keys()))
+        self.api_key_mgr = cls._api_key_mgr
+        self.config = cls._config
+        self._provider_key = os.getenv("LLM_PROVIDER", "google")
+
+    @classmethod
+    def reset_cache(cls):
+        """
+        Drop the cached config, API keys and model clients (e.g. between tests).
+        """
+        global _DOTENV_LOADED
+        _DOTENV_LOADED = False
+        cls._config = None
+        cls._api_key_mgr = None
+        _google_embeddings.cache_clear()
+        _google_llm.cache_clear()
+        _groq_llm.cache_clear()
+        _close_http_clients()
 
     def load_embeddings(self):
         """
@@ -73,8 +196,7 @@ class ModelLoader:
         try:
             model_name = self.config["embedding_model"]["model_name"]
             log.info("Loading embedding model", model=model_name)
-            return GoogleGenerativeAIEmbeddings(model=model_name,
-                                                google_api_key=self.api_key_mgr.get("GOOGLE_API_KEY")) #type: ignore
+            return _google_embeddings(model_name, self.api_key_mgr.get("GOOGLE_API_KEY"))
         except Exception as e:
             log.error("Error loading embedding model", error=str(e))
             raise DocumentPortalException("Failed to load embedding model", sys)
@@ -83,47 +205,21 @@ class ModelLoader:
         """
         Load and return the configured LLM model.
         """
-        llm_block = self.config["llm"]
-        provider_key = os.getenv("LLM_PROVIDER", "google")
-
-        if provider_key not in llm_block:
-            log.error("LLM provider not found in config", provider=provider_key)
-            raise ValueError(f"LLM provider '{provider_key}' not found in config")
-
-        llm_config = llm_block[provider_key]
-        provider = llm_config.get("provider")
-        model_name = llm_config.get("model_name")
-        temperature = llm_config.get("temperature", 0.2)
-        max_tokens = llm_config.get("max_output_tokens", 2048)
-
-        log.info("Loading LLM", provider=provider, model=model_name)
-
-        if provider == "google":
-            return ChatGoogleGenerativeAI(
-                model=model_name,
-                google_api_key=self.api_key_mgr.get("GOOGLE_API_KEY"),
-                temperature=temperature,
-                max_output_tokens=max_tokens
-            )
-
-        elif provider == "groq":
-            return ChatGroq(
-                model=model_name,
-                api_key=self.api_key_mgr.get("GROQ_API_KEY"), #type: ignore
-                temperature=temperature,
-            )
-
-        # elif provider == "openai":
-        #     return ChatOpenAI(
-        #         model=model_name,
-        #         api_key=self.api_key_mgr.get("OPENAI_API_KEY"),
-        #         temperature=temperature,
-        #         max_tokens=max_tokens
-        #     )
+        try:
+            llm_config = self.config["llm"].get(self._provider_key)
+            if llm_config is None:
+                raise ValueError(f"LLM provider '{self._provider_key}' not found in config")
 
-        else:
-            log.error("Unsupported LLM provider", provider=provider)
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+            provider = llm_config.get("provider")
+            factory = self._LLM_FACTORIES.get(provider)
+            if factory is None:
+                raise ValueError(f"Unsupported LLM provider: {provider}")
+
+            log.info("Loading LLM", provider=provider, model=llm_config.get("model_name"))
+            return factory(llm_config, self.api_key_mgr)
+        except Exception as e:
+            log.error("Error loading LLM", provider=self._provider_key, error=str(e))
+            raise DocumentPortalException("Failed to load LLM", sys)
 
 
 if __name__ == "__main__":
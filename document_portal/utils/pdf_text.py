@@ -0,0 +1,65 @@
+# utils/pdf_text.py
+# Kept free of app imports: spawned worker processes import this module to unpickle _extract_pages.
+from __future__ import annotations
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+import fitz  # PyMuPDF
+
+# PyMuPDF is not thread-safe and holds the GIL, so large PDFs are split into
+# page ranges that worker processes extract from their own Document handle.
+# With the pool below kept warm, a call only pays for each worker re-opening the file
+# and pickling its pages back. The 100-page cut-over is a conservative, unmeasured
+# default; tune it from profiling on real documents.
+PARALLEL_MIN_PAGES = 100
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# One pool per process, created on first use: workers (and their fitz import) are
+# started once instead of on every call
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn, not fork: the parent runs the logging listener thread
+            ctx = multiprocessing.get_context("spawn")
+            _POOL = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=ctx)
+        return _POOL
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False)
+
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    with fitz.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text() for i in range(start, stop)]  # type: ignore
+
+
+def read_pdf_pages(pdf_path: str) -> List[str]:
+    """Return the text of every page, in page order."""
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+        if page_count < PARALLEL_MIN_PAGES or MAX_WORKERS < 2:
+            return [page.get_text() for page in doc]  # type: ignore
+
+    step = -(-page_count // MAX_WORKERS)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    pool = _get_pool()
+    try:
+        futures = [pool.submit(_extract_pages, str(pdf_path), start, stop) for start, stop in ranges]
+        return [text for fut in futures for text in fut.result()]
+    except BrokenProcessPool:
+        # a worker died (e.g. OOM-killed); replace the pool next time and finish serially
+        _discard_pool(pool)
+        return _extract_pages(str(pdf_path), 0, page_count)
@@ -4,10 +4,12 @@ packages = [
     "python-dotenv",
     "ipykernel",
     "langchain_groq",
+    "httpx",
     "langchain_google_genai",
     "langchain-community",
     "faiss-cpu",
     "structlog",
+    "orjson",
     "PyMuPDF",
     "pylint",
     "langchain-core",